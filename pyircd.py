@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 
-import asyncore
+import asyncio
 import logging
 
 from pyircd.config import Config
@@ -14,7 +14,9 @@ class PyIRCD:
         self.config = Config()
         self.config.version = VERSION
         logging.basicConfig(level=logging.DEBUG)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
         self.network = IRCNetwork(self.config)
-        asyncore.loop()
+        self.loop.run_forever()
 
 PyIRCD()
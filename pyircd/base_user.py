@@ -1,16 +1,29 @@
+from .message import Message
+
 class BaseUser:
+    __slots__ = ('_hostmask', '_identifier')
 
     @property
     def source_str(self):
-        return self.identifier
+        return self._identifier
 
     @property
     def hostmask(self):
-        return self.username + '@' + self.host
+        return self._hostmask
 
     @property
     def identifier(self):
-        return self.nick + '!' + self.hostmask
+        return self._identifier
+
+    def _rebuild_identifier(self):
+        """Rebuild the cached hostmask and identifier.
+
+        These are read for every message the user is the source of, so they
+        are only built when the nick, username or host actually change.
+
+        """
+        self._hostmask = self.username + '@' + self.host
+        self._identifier = self.nick + '!' + self._hostmask
 
     def add_mode(self, mode):
         self.modes.append(mode)
@@ -22,5 +35,5 @@ class BaseUser:
         self.send_msg(msg)
 
     def __str__(self):
-        return self.identifier
+        return self._identifier
 
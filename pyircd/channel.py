@@ -9,6 +9,9 @@ PARAM_MODES = ['l', 'k', 'b', 'e']
 SIMPLE_MODES = ['m', 's', 'i', 't', 'n'] 
 # Op, voice
 USER_MODES = ['o', 'v']
+# Longest list of nicks in one RPL_NAMREPLY, leaving room in the 512 byte
+# line for the prefix, target nick and channel name.
+NAMREPLY_MAX_LEN = 400
 
 
 class Channel:
@@ -51,7 +54,7 @@ class Channel:
             raise ChannelFullError(self.name)
 
         self.users.append(user)
-        user.channels.append(self)
+        user.channels.add(self)
         self.send_to_all(
             Message('JOIN', [self.name], source=user))
 
@@ -77,7 +80,7 @@ class Channel:
         if user.unique_id in self.usermodes:
             del self.usermodes[user.unique_id]
 
-        user.channels.remove(self)
+        user.channels.discard(self)
         if msg is None:
             self.send_to_all(
                 Message('PART', [self.name], False, user))
@@ -378,7 +381,7 @@ class Channel:
                     self.name,
                     user.username,
                     user.host,
-                    self.server.config.hostname,
+                    self.server.hostname,
                     user.nick,
                     mode_prefix,
                     user.real_name
@@ -406,13 +409,27 @@ class Channel:
             return ''
 
     def send_user_list(self, target):
-        """Send a user the list of people in this channel."""
-        nicks = [
-            self.get_mode_prefix(user) + user.nick for user in self.users
-        ]
+        """Send a user the list of people in this channel.
 
-        nick_str = ' '.join(nicks)
-        target.send_numeric(numerics.RPL_NAMREPLY, [self.name, nick_str])
+        As many nicks as fit in NAMREPLY_MAX_LEN are packed into each
+        RPL_NAMREPLY, so large channels need only a few lines.
+
+        """
+        nicks = []
+        length = 0
+        for user in self.users:
+            nick = self.get_mode_prefix(user) + user.nick
+            if nicks and length + len(nick) > NAMREPLY_MAX_LEN:
+                target.send_numeric(
+                    numerics.RPL_NAMREPLY, [self.name, ' '.join(nicks)])
+                nicks = []
+                length = 0
+            nicks.append(nick)
+            length += len(nick) + 1
+
+        if nicks:
+            target.send_numeric(
+                numerics.RPL_NAMREPLY, [self.name, ' '.join(nicks)])
         target.send_numeric(numerics.RPL_ENDOFNAMES, [self.name])
 
     def send_topic(self, target):
@@ -6,13 +6,27 @@ CHANNEL_MIN_NAME_LEN = 3
 NICK_MAX_LEN = 16
 NICK_MIN_LEN = 3
 
+# Matches CHANTYPES in RPL_ISUPPORT
+CHANNEL_PREFIXES = frozenset('#&')
+
 def is_channel_name(name):
     """ Perform a quick check to see if a given string
     looks like a channel name. 
     
     Does not check if the channel name is valid.
     """
-    return name.startswith('#') or name.startswith('&')
+    return name[:1] in CHANNEL_PREFIXES
+
+def iter_comma_list(items):
+    """Iterate over the entries of a comma seperated parameter.
+
+    Entries are produced one at a time without building a list, and empty
+    entries (e.g. from a trailing comma) are skipped.
+    """
+    while items:
+        item, _, items = items.partition(',')
+        if item:
+            yield item
 
 def is_valid_channel_name(channel):
     """Check to see if a given channel name is valid."""
@@ -56,13 +70,12 @@ def build_irc_msg(command, params, final_param_multi_word=False,
         final_param = params[-1]
 
     if source:
-        prefix = ':' + source
+        prefix = ':' + source + ' '
     else:
         prefix = ''
 
     if len(params) > 1:
-        parts = [prefix, command, ' '.join(params[:-1]), final_param]
+        return '%s%s %s %s\r\n' % (prefix, command, ' '.join(params[:-1]),
+                final_param)
     else:
-        parts = [prefix, command, final_param]
-
-    return ' '.join(parts).strip() + '\r\n'
+        return '%s%s %s\r\n' % (prefix, command, final_param)
@@ -12,11 +12,23 @@ class Message:
         if source is None and command != 'PING':
             logging.info('Source-less %s message created.', command)
         self.source = source
+        self._encoded = None
 
     @property
     def last(self):
         return self.params[-1]
 
+    def encode(self):
+        """Return the message as an encoded line, ready to be sent.
+
+        The same message is usually sent to everyone in a channel, so it is
+        only built and encoded once.
+
+        """
+        if self._encoded is None:
+            self._encoded = str(self).encode(encoding='utf-8')
+        return self._encoded
+
     def __str__(self):
         if self.final_param_multi:
             final_param = ':' + self.params[-1]
@@ -24,16 +36,15 @@ class Message:
             final_param = self.params[-1]
 
         if self.source:
-            prefix = ':' + self.source.source_str
+            prefix = ':' + self.source.source_str + ' '
         else:
             prefix = ''
 
         if len(self.params) > 1:
-            parts = [prefix, self.command, ' '.join(self.params[:-1]), final_param]
+            return '%s%s %s %s\r\n' % (prefix, self.command,
+                    ' '.join(self.params[:-1]), final_param)
         else:
-            parts = [prefix, self.command, final_param]
-
-        return ' '.join(parts).strip() + '\r\n'
+            return '%s%s %s\r\n' % (prefix, self.command, final_param)
 
 def msg_from_string(msg_str, default_source=None):
     """Take an IRC message string and return a Message object. 
@@ -43,40 +54,36 @@ def msg_from_string(msg_str, default_source=None):
     """
     try:
         if msg_str[0] == ':':
-            before, after = msg_str.split(' ', 1)
-            source = before[1:] # Drop colon
-            msg_str = after
+            source, _, msg_str = msg_str.partition(' ')
+            source = source[1:] # Drop colon
         else:
             source = default_source
 
-        final_part_multi = False
-        if ':' in msg_str:
-            final_part_multi = True
-            before, after = msg_str.split(':', 1)
-            params = before.strip().split(' ') + [after]
-        else:
-            params = [part.strip() for part in msg_str.split(' ')]
+        # Only a colon at the start of a parameter begins the trailing one.
+        before, final_part_multi, after = msg_str.partition(' :')
+        params = before.split()
+        if final_part_multi:
+            params.append(after)
 
         command = params[0]
         params = params[1:]
 
-        return Message(command, params, final_part_multi, source)
+        return Message(command, params, bool(final_part_multi), source)
     except IndexError:
         raise InvalidMessageError()
         
 def irc_msg_split(message, full_message=True):
     """Splits an IRC message (or partial IRC message) into its constituent parts."""
     if message[0] == ':' and full_message:
-        message = ''.join(message.split(' ', 1)[1:]) # Drop source for now.
-
-    if ':' in message:
-        before, after = message.split(':', 1)
-        # This test is because of partial messages
-        # that begin with :
-        # e.g. RPL_MOTD segments
-        if before.strip() != '':
-            return before.strip().split(' ') + [after]
-        else:
-            return [after]
-    else:
-        return [part.strip() for part in message.split(' ')]
+        message = message.partition(' ')[2] # Drop source for now.
+
+    # Partial messages can be nothing but a trailing parameter
+    # e.g. RPL_MOTD segments
+    if message[:1] == ':':
+        return [message[1:]]
+
+    before, sep, after = message.partition(' :')
+    parts = before.split()
+    if sep:
+        parts.append(after)
+    return parts
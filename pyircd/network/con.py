@@ -1,38 +1,49 @@
-import asynchat
+import asyncio
 import logging
 from pyircd.ircutils import *
 from pyircd.message import *
 from pyircd.user import User
 from pyircd import numerics
 
-class IRCCon(asynchat.async_chat): # pragma: no cover
+class IRCCon(asyncio.Protocol): # pragma: no cover
     """Handles a single client's IRC Connection."""
     
-    def __init__(self, socket, address, server):
-        asynchat.async_chat.__init__(self, sock=socket)
-        self.socket = socket
-        self.address = address
+    def __init__(self, server):
+        self.transport = None
+        self.address = None
+        self.host = None
         self.server = server
 
         self.unique_id = server.highest_unique_id
-        self.set_terminator(b'\r\n')
         self.user = None
         self.con_server = None
 
         self.nick = None; # Ignored after initial auth
 
-        self.ibuffer = []
-        self.obuffer = b''
+        self.ibuffer = b''
+        # Outgoing lines are collected here and written out together.
+        self.obuffer = bytearray()
+        self.flush_pending = False
 
         self.nick_done = False
         self.user_done = False
 
-    def collect_incoming_data(self, data):
-        self.ibuffer.append(data)
-
-    def found_terminator(self):
-        msg_bytes = b''.join(self.ibuffer)
-
+    def connection_made(self, transport):
+        self.transport = transport
+        self.address = transport.get_extra_info('peername')
+        self.host = self.address[0]
+
+    def data_received(self, data):
+        lines = (self.ibuffer + data).split(b'\r\n')
+        # Whatever follows the last terminator is an incomplete line.
+        self.ibuffer = lines.pop()
+        for line in lines:
+            if self.transport.is_closing():
+                break # e.g. after a QUIT
+            self.found_terminator(line)
+        self.flush()
+
+    def found_terminator(self, msg_bytes):
         # Some clients leave trailing spaces at the end
         # where they shouldn't. *cough* libpurple JOIN *cough*
         try: 
@@ -50,38 +61,53 @@ class IRCCon(asynchat.async_chat): # pragma: no cover
                 if self.nick_done and self.user_done:
                     self.create_user()
             elif self.user is not None:
-                msg = msg_from_string(msg)
                 self.user.handle_cmd(msg)
-        finally: 
-            # Make sure the buffer gets emptied out in case of an error
-            # Otherwise the connection ends up continously erroring on the
-            # one message.
-            self.ibuffer = []
+        except Exception:
+            self.handle_error()
 
     def handle_ping(self, msg_str):
         msg = msg_from_string(msg_str)
         if len(msg.params) == 1:
             info = msg.params[0]
             self.send_raw(build_irc_msg('PONG', [info], True,
-                self.server.config.hostname))
+                self.server.hostname).encode(encoding='utf-8'))
 
     def handle_error(self):
+        logging.exception("Error handling data from %s", self.address)
         if self.user:
             self.server.quit_user(self.user, "Internet Server Error")
-        asynchat.async_chat.handle_error(self)
+        self.close()
 
-    def handle_close(self):
+    def connection_lost(self, exc):
         if self.user:
             self.server.quit_user(self.user, "Connection Lost")
 
     def send_raw(self, msg):
-        self.push(msg.encode(encoding="utf-8"))
+        """Queue an encoded line to be sent on the next flush."""
+        self.obuffer += msg
+        if not self.flush_pending:
+            # Lines for this connection may be queued while handling
+            # another connection's data (e.g. a channel message), so make
+            # sure they are written once the current callback is done.
+            self.flush_pending = True
+            asyncio.get_event_loop().call_soon(self.flush)
+
+    def flush(self):
+        """Write everything queued by send_raw to the transport at once."""
+        self.flush_pending = False
+        if self.obuffer and not self.transport.is_closing():
+            self.transport.write(bytes(self.obuffer))
+        self.obuffer.clear()
+
+    def close(self):
+        self.flush()
+        self.transport.close()
 
     def handle_initial_nick(self, msg_str):
         msg = msg_from_string(msg_str)
         nick = msg.params[0]
         if nick in self.server.used_nicks:
-            self.send_numeric(numerics.ERR_NICKNAMEINUSE, [nick], True)
+            self.send_numeric(numerics.ERR_NICKNAMEINUSE, [nick])
         else:
             self.nick = nick
             self.nick_done = True
@@ -89,18 +115,14 @@ class IRCCon(asynchat.async_chat): # pragma: no cover
     def handle_user(self, msg_str):
         msg = msg_from_string(msg_str)
         if len(msg.params) != 4:
-            self.send_numeric(numerics.ERR_NEEDMOREPARAMS, ['USER'], True)
+            self.send_numeric(numerics.ERR_NEEDMOREPARAMS, ['USER'])
         else:
             username, visibility, ignore, real_name = msg.params
             self.real_name = real_name
             self.username = username
             self.user_done = True
 
-    def handle_close(self):
-        self.close()
-
-    def send_numeric(self, numeric, sparams, final_param_multi=False,
-        source=None):
+    def send_numeric(self, numeric, sparams, source=None):
         """Send a numeric to the user.
 
         This method should only be used before a user registers when no
@@ -108,18 +130,14 @@ class IRCCon(asynchat.async_chat): # pragma: no cover
         User.send_numeric instead.
         """
         if not source:
-            source = self.server.config.hostname
+            source = self.server.hostname
 
-        message = build_irc_msg(
-            numeric.num_str,
-            irc_msg_split(numeric.message.format(*sparams)),
-            final_param_multi,
-            source
-        )
-        self.send_raw(message)
+        # No nick has been accepted yet, so address it to * as per RFC 2812
+        self.send_raw(numeric.render(source, '*', sparams))
 
     def create_user(self):
-        self.user = User(self.nick, self.username, self.real_name, self.addr,
+        self.user = User(self.nick, self.username, self.real_name,
+                self.host,
                 self.server, self)
         self.server.connect_user(self.user)
         logging.info(self.user.identifier + " joined.")
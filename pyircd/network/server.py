@@ -1,5 +1,4 @@
-import asyncore
-import socket
+import asyncio
 import logging
 
 from .con import IRCCon
@@ -13,21 +12,25 @@ from .. import numerics
 class InvalidChannelError(Exception): pass
 
 # Don't test this class as it's all about IO.
-class NetworkHandler(asyncore.dispatcher): # pragma: no cover
+class NetworkHandler: # pragma: no cover
     def __init__(self, server, handler_class=IRCCon):
-        asyncore.dispatcher.__init__(self)
         self.server = server
         self.handler_class = handler_class
-        self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.bind((self.server.config.hostname, self.server.config.port))
-        self.listen(5)
-
-    def handle_accepted(self, conn, address):
-        con = self.handler_class(conn, address, self.server)
+        loop = asyncio.get_event_loop()
+        self.listener = loop.run_until_complete(loop.create_server(
+            self.handle_accepted,
+            self.server.config.hostname,
+            self.server.config.port,
+            backlog=5
+        ))
+
+    def handle_accepted(self):
+        con = self.handler_class(self.server)
         self.server.handle_new_connection(con)
+        return con
 
-    def handle_close(self):
-        self.close()
+    def close(self):
+        self.listener.close()
 
 class IRCServer:
     """Handles the network aspect of the IRC server."""
@@ -35,6 +38,11 @@ class IRCServer:
     def __init__(self, config, network, handler_class=IRCCon,
             netaccess_class=NetworkHandler):
         self.config = config
+        # Config lookups go through __getattr__, so keep the values used
+        # for every outgoing message to hand.
+        self.hostname = config.hostname
+        self.motd_lines = config.motd.splitlines()
+
         self.netaccess = netaccess_class(self)
         self.handler_class = handler_class
 
@@ -51,7 +59,7 @@ class IRCServer:
 
     @property
     def source_str(self):
-        return self.config.hostname
+        return self.hostname
 
     def handle_new_connection(self, con):
         """Handle a new connection to the server."""
@@ -75,12 +83,12 @@ class IRCServer:
         if user.unique_id in self.users:
             del self.users[user.unique_id]
             self.used_nicks.remove(user.nick)
-        for channel in list(self.channels.keys()):
-            if user in self.channels[channel]:
-                if reason:
-                    self.channels[channel].part(user, reason)
-                else:
-                    self.channels[channel].part(user)
+        # Parting removes the channel from user.channels, so iterate a copy.
+        for channel in list(user.channels):
+            if reason:
+                channel.part(user, reason)
+            else:
+                channel.part(user)
 
     def remove_channel(self, channel):
         """Remove a channel from the server.
@@ -169,8 +177,8 @@ class IRCServer:
 
     def send_motd(self, user):
         """Send the MOTD to the user."""
-        user.send_numeric(numerics.RPL_MOTDSTART, [self.config.hostname])
-        for line in self.config.motd.splitlines():
+        user.send_numeric(numerics.RPL_MOTDSTART, [self.hostname])
+        for line in self.motd_lines:
             user.send_numeric(numerics.RPL_MOTD, [line])
         user.send_numeric(numerics.RPL_ENDOFMOTD)
 
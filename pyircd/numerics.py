@@ -8,6 +8,24 @@ class NumericReply():
         self.num_str = str(self.number).zfill(3)
         self.message = message
         self.final_multi = final_multi
+        # The whole line as a %-style format, taking the source and target
+        # followed by the message parameters, so sending is one format call.
+        self.wire_fmt = (':%s ' + self.num_str + ' %s ' +
+            message.replace('%', '%%').replace('{}', '%s') + '\r\n')
+
+    def render(self, source, target, sparams=None):
+        """Build the full encoded line for this numeric, ready to be sent.
+
+        source is the string used as the message prefix, target is the nick
+        the numeric is addressed to, and sparams fill in the placeholders
+        in message.
+
+        """
+        line = self.wire_fmt % ((source, target) + tuple(sparams or ()))
+        if not self.final_multi:
+            # Drop the trailing space left by an empty last parameter.
+            line = line.rstrip() + '\r\n'
+        return line.encode(encoding='utf-8')
 
 # nick!user@host
 RPL_WELCOME = NumericReply(
@@ -27,7 +45,7 @@ RPL_MYINFO = NumericReply(4, "{} {} {} {}", False)
 # Network name
 RPL_ISUPPORT = NumericReply(5, "PREFIX=(ov)@+ CHANTYPES=#& NETWORK={}"
 " CASEMAPPING=ascii CHANMODES=beI,k,l,imnst EXCEPTS=e CHANNELLEN=32"
-":are supported by this server")
+" :are supported by this server")
 
 # Modes
 RPL_UMODEIS = NumericReply(221, "+{}", False)
@@ -94,7 +112,7 @@ ERR_NICKNAMEINUSE = NumericReply(433, "{} :Nickname already in use")
 ERR_USERNOTINCHANNEL = NumericReply(441, "{} {} :They aren't on that channel")
 
 # Channel
-ERR_NOTONCHANNEL = NumericReply(442, "{}: You're not on that channel")
+ERR_NOTONCHANNEL = NumericReply(442, "{} :You're not on that channel")
 
 # Command attempted
 ERR_NEEDMOREPARAMS = NumericReply(461, "{} :Not enough parameters")
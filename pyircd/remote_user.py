@@ -1,15 +1,18 @@
 from .base_user import BaseUser
 
 class RemoteUser(BaseUser):
+    __slots__ = ('nick', 'username', 'real_name', 'host', 'server', 'modes',
+            'channels')
 
     def __init__(self, nick, username, real_name, host, server):
         self.nick = nick
         self.username = username
         self.real_name = real_name
         self.host = host
+        self._rebuild_identifier()
         self.server = server
         self.modes = []
-        self.channels = []
+        self.channels = set()
 
     def send_msg(self, msg):
         self.server.send_msg(msg)
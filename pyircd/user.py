@@ -1,89 +1,39 @@
 from pyircd.ircutils import *
-from pyircd.message import Message, msg_from_string, InvalidMessageError, \
-        irc_msg_split
+from pyircd.message import Message, msg_from_string, InvalidMessageError
 from pyircd.errors import NoSuchUserError, NoSuchChannelError, \
         InsufficientParamsError, BadKeyError, NeedChanOpError, ChannelFullError
 from pyircd import numerics
+# Sent from the dispatch path, so imported directly to save an attribute
+# lookup on every use.
+from pyircd.numerics import ERR_NEEDMOREPARAMS, ERR_NOSUCHNICK, \
+        ERR_NOSUCHCHANNEL, ERR_CHANOPRIVSNEEDED, ERR_UNKNOWNCOMMAND
 from .base_user import BaseUser
 
-from functools import wraps
 from itertools import zip_longest
 
-def handler(func):
-    """Set a function up as a handler, including some common error handling."""
-    @wraps(func)
-    def inner_handler(self, msg):
-        try:
-            func(self, msg)
-        except NoSuchUserError as e:
-            self.send_numeric(
-                numerics.ERR_NOSUCHNICK,
-                [e.target]
-            )
-        except InsufficientParamsError as e:
-            self.send_numeric(
-                numerics.ERR_NEEDMOREPARAMS,
-                [e.command]
-            )
-        except NoSuchChannelError as e:
-            self.send_numeric(
-                numerics.ERR_NOSUCHCHANNEL,
-                [e.channel]
-            )
-        except NeedChanOpError as e:
-            self.send_numeric(
-                numerics.ERR_CHANOPRIVSNEEDED,
-                [e.channel]
-            )
-    return inner_handler
-
-def min_params(num_params):
-    """Reply with ERR_NEEDMOREPARAMS if too few parameters are sent in an irc
-    message.
-    """
-    def decorate(func):
-        @wraps(func)
-        def handler(self, msg):
-            if len(msg.params) < num_params:
-                raise InsufficientParamsError(msg.command)
-            else:
-                func(self, msg)
-        return handler
-    return decorate
-
 class User(BaseUser):
+    __slots__ = ('nick', 'username', 'real_name', 'server', 'connection',
+            'unique_id', 'host', 'channels', 'modes')
 
     def __init__(self, nick, username, real_name, host, server, connection):
-        self.handle_commands = {
-            'PRIVMSG': self.handle_privmsg,
-            'JOIN': self.handle_join,
-            'PART': self.handle_part,
-            'QUIT': self.handle_quit,
-            'NAMES': self.handle_names,
-            'TOPIC': self.handle_topic,
-            'WHO': self.handle_who,
-            'WHOIS': self.handle_whois,
-            'MODE': self.handle_mode,
-            'OPER': self.handle_oper,
-            'MOTD': self.handle_motd
-        }
-
         self.nick = nick
         self.username = username
         self.real_name = real_name
         self.server = server
         self.connection = connection
         self.unique_id = connection.unique_id
-        self.host = self.connection.address[0]
+        self.host = connection.host
+        self._rebuild_identifier()
         
         self.send_opening_numerics()
         self.server.send_isupport(self)
         self.server.send_motd(self)
-        self.channels = []
+        self.channels = set()
         self.modes = []
 
     def send_opening_numerics(self):
         """ Send the opening numerics for a new connection."""
+        config = self.server.config
         self.send_numeric(numerics.RPL_WELCOME, 
             [
                 self.nick,
@@ -94,8 +44,8 @@ class User(BaseUser):
 
         self.send_numeric(numerics.RPL_YOURHOST,
             [
-                self.server.config.hostname,
-                self.server.config.version
+                config.hostname,
+                config.version
             ]
         )
 
@@ -107,8 +57,8 @@ class User(BaseUser):
 
         self.send_numeric(numerics.RPL_MYINFO,
             [
-                self.server.config.hostname,
-                self.server.config.version,
+                config.hostname,
+                config.version,
                 "Oov",
                 "kl"
             ]
@@ -121,54 +71,102 @@ class User(BaseUser):
         )
 
 
-    def handle_cmd(self, msg):
-        func = self.handle_commands.get(
-            msg.command.upper(), self.handle_unknown)
-        func(msg)
+    def handle_cmd(self, msg_str):
+        """Parse a raw line from the client and dispatch it.
+
+        The line is only parsed once here; handlers receive the resulting
+        Message object rather than re-splitting the string themselves.
+
+        """
+        try:
+            msg = msg_from_string(msg_str)
+        except InvalidMessageError:
+            return # Blank line, nothing to reply to.
+
+        entry = self.handle_commands.get(msg.command)
+        if entry is None:
+            # Clients nearly always send commands in upper case, so only
+            # normalise the case when the exact lookup misses.
+            entry = self.handle_commands.get(msg.command.upper())
+        if entry is None:
+            self.handle_unknown(msg)
+            return
+
+        num_params, func = entry
+        if len(msg.params) < num_params:
+            self.send_numeric(ERR_NEEDMOREPARAMS, [msg.command])
+            return
+
+        try:
+            func(self, msg)
+        except NoSuchUserError as e:
+            self.send_numeric(
+                ERR_NOSUCHNICK,
+                [e.target]
+            )
+        except InsufficientParamsError as e:
+            self.send_numeric(
+                ERR_NEEDMOREPARAMS,
+                [e.command]
+            )
+        except NoSuchChannelError as e:
+            self.send_numeric(
+                ERR_NOSUCHCHANNEL,
+                [e.channel]
+            )
+        except NeedChanOpError as e:
+            self.send_numeric(
+                ERR_CHANOPRIVSNEEDED,
+                [e.channel]
+            )
     
     def handle_unknown(self, msg):
-        self.send_numeric(numerics.ERR_UNKNOWNCOMMAND, [msg.command])
+        self.send_numeric(ERR_UNKNOWNCOMMAND, [msg.command])
 
-    @handler
-    @min_params(2)
     def handle_privmsg(self, msg):
         """Handle recieving a message from the user"""
-        targets = msg.params[0].split(',')
-        for target in targets:
-            if is_channel_name(target):
+        for target in iter_comma_list(msg.params[0]):
+            if target[0] in CHANNEL_PREFIXES: # Inlined is_channel_name
                 self.server.get_channel(target).msg(self, msg.last)
             else:
                 target_user = self.server.get_user(target)
                 target_user.msg(self, target, msg.last)
 
-    @handler
     def handle_motd(self, msg):
         self.server.send_motd(self)
 
-    @handler
-    @min_params(1)
     def handle_join(self, msg):
         """Handle the user attempting to join a channel"""
-        channels = msg.params[0].split(',')
-        keys = msg.params[1].split(',') if len(msg.params) > 1 else []
-        for channel, key in zip_longest(channels, keys):
+        channels = msg.params[0]
+        keys = msg.params[1] if len(msg.params) > 1 else None
+
+        if ',' not in channels:
+            # Usual case of a single channel, no lists to pair up.
+            key = keys.partition(',')[0] if keys else None
+            self.join_channel(channels, key)
+            return
+
+        keys = keys.split(',') if keys else []
+        for channel, key in zip_longest(channels.split(','), keys):
             if channel is None:
                 break
-            try:
-                self.server.join_user_to_channel(self, channel, key)
-            except BadKeyError as e:
-                self.send_numeric(
-                    numerics.ERR_BADCHANNELKEY,
-                    [e.channel]
-                )
-            except ChannelFullError as e:
-                self.send_numeric(
-                    numerics.ERR_CHANNELISFULL,
-                    [e.channel]
-                )
-
-    @handler
-    @min_params(1)
+            self.join_channel(channel, key)
+
+    def join_channel(self, channel, key=None):
+        """Join the user to a channel, telling them if they're refused."""
+        try:
+            self.server.join_user_to_channel(self, channel, key)
+        except BadKeyError as e:
+            self.send_numeric(
+                numerics.ERR_BADCHANNELKEY,
+                [e.channel]
+            )
+        except ChannelFullError as e:
+            self.send_numeric(
+                numerics.ERR_CHANNELISFULL,
+                [e.channel]
+            )
+
     def handle_part(self, msg):
         """Handle the user leaving a channel"""
         if len(msg.params) == 2:
@@ -179,7 +177,6 @@ class User(BaseUser):
 
         self.server.get_channel(channel).part(self, reason)
 
-    @handler
     def handle_quit(self, msg):
         """Handle the user quitting from the server"""
         if len(msg.params) == 1:
@@ -189,12 +186,10 @@ class User(BaseUser):
             self.server.quit_user(self)
         self.connection.close()
     
-    @handler
     def handle_names(self, msg):
         """Handle a request for the names command"""
         if len(msg.params) == 1:
-            channels = msg.params[0]
-            for channel in channels.split(','):
+            for channel in iter_comma_list(msg.params[0]):
                 chan_obj = self.server.get_channel(channel)
                 chan_obj.send_user_list(self)
         else:
@@ -202,8 +197,6 @@ class User(BaseUser):
                 chan_obj = self.server.get_channel(channel)
                 chan_obj.send_user_list(self)
 
-    @handler
-    @min_params(1)
     def handle_topic(self, msg):
         """Handle a request for a channel topic or topic change"""
         channel = msg.params[0]
@@ -214,8 +207,6 @@ class User(BaseUser):
             new_topic = msg.params[1]
             chan_obj.try_set_topic(self, new_topic)
 
-    @handler
-    @min_params(1)
     def handle_mode(self, msg):
         """Handle a mode message."""
         if is_channel_name(msg.params[0]):
@@ -252,52 +243,52 @@ class User(BaseUser):
                     else:
                         self.modes.remove(mode)
 
-    @handler
-    @min_params(1)
     def handle_who(self, msg):
         """Handle recieving a WHO message."""
         channel = msg.params[0]
         self.server.get_channel(channel).send_who(self)
 
-    @handler
-    @min_params(1)
     def handle_whois(self, msg):
         """Handle a WHOIS message being recieved."""
-        targets = msg.params[0]
-        for target in targets.split(','):
+        for target in iter_comma_list(msg.params[0]):
             self.server.send_whois(target, self)
 
-    @handler
-    @min_params(2)
     def handle_oper(self, msg):
         """Handle a OPER command being recieved."""
         self.server.try_make_oper(self, msg.params[0], msg.params[1])
 
     def send_numeric(self, numeric, sparams=None, source=None):
         """Send a numeric command to the user"""
-        if sparams is None:
-            sparams = []
-
         if source is None:
             source = self.server
 
-        message = numeric.message.format(*sparams)
-        params = [self.nick] + irc_msg_split(message, False)
-
-        self.send_msg(Message(
-            numeric.num_str,
-            params,
-            numeric.final_multi, 
-            source
-        ))
+        self.send_raw(numeric.render(source.source_str, self.nick, sparams))
 
     def send_msg(self, message):
         """Send a message object as an IRC message."""
-        self.send_raw(str(message))
+        self.send_raw(message.encode())
 
     def send_raw(self, message):
+        """Send an already encoded line to the user."""
         self.connection.send_raw(message)
 
     def can_set_own_mode(self, mode):
         """Check if a user can set a mode on themselves."""
         return mode not in ['o', 'O']
+
+    # Built once with the class rather than for every connection.
+    # Each command maps to the minimum number of parameters it needs and
+    # the function that handles it.
+    handle_commands = {
+        'PRIVMSG': (2, handle_privmsg),
+        'JOIN': (1, handle_join),
+        'PART': (1, handle_part),
+        'QUIT': (0, handle_quit),
+        'NAMES': (0, handle_names),
+        'TOPIC': (1, handle_topic),
+        'WHO': (1, handle_who),
+        'WHOIS': (1, handle_whois),
+        'MODE': (1, handle_mode),
+        'OPER': (2, handle_oper),
+        'MOTD': (0, handle_motd)
+    }
@@ -1,4 +1,8 @@
 class MockChannel:
+    __slots__ = ('topic', 'limit', 'key', 'usermodes', 'users', 'modes',
+            'name', 'server', 'joins', 'parts', 'msgs', 'mode_changes',
+            'topic_sends', 'userl_sends')
+
     def __init__(self, name, server, limit=None, topic=None, key=None):
         self.topic = topic
         self.limit = limit
@@ -22,10 +26,12 @@ class MockChannel:
     def join(self, user, key=None):
         self.joins.append({'user': user.nick, 'key': key})
         self.users.append(user)
+        user.channels.add(self)
 
     def part(self, user, msg=None):
         self.parts.append({'user': user.nick, 'msg': msg})
         self.users.remove(user)
+        user.channels.discard(self)
 
     def msg(self, source, message):
         self.msgs.append({'source': source.nick, 'message': message})
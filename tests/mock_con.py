@@ -5,6 +5,7 @@ class MockCon():
             self.address = ('127.0.0.1', 1337)
         else:
             self.address = address
+        self.host = self.address[0]
         self.server = server
         if self.server is not None:
             self.unique_id = self.server.highest_unique_id
@@ -21,7 +22,7 @@ class MockCon():
         self.user = user
 
     def send_raw(self, msg):
-        self.sent_msgs.add(msg)
+        self.sent_msgs.add(msg.decode('utf-8'))
 
     def close(self):
         self.closed = True
@@ -2,6 +2,9 @@ from pyircd.errors import BadKeyError, ChannelFullError
 from .mock_con import MockCon
 
 class MockConfig():
+    __slots__ = ('hostname', 'port', 'version', 'opers', 'netname', 'info',
+            'max_targets', 'motd')
+
     def __init__(self):
         self.hostname = 'example.com'
         self.port = 1337
@@ -14,11 +17,17 @@ class MockConfig():
         self.motd = "Welcome.\nPyIRCd testing"
 
 class MockServer():
+    __slots__ = ('motd_sent', 'isupport_sent', 'config', 'hostname',
+            'channel_joins', 'quits', 'whoises', 'return_user',
+            'return_channel', 'highest_unique_id')
+
     def __init__(self, config=None):
         self.motd_sent = False
         self.isupport_sent = False
         if config is None:
-            self.config = MockConfig()
+            config = MockConfig()
+        self.config = config
+        self.hostname = config.hostname
         self.channel_joins = []
         self.quits = []
         self.whoises = []
@@ -28,6 +37,10 @@ class MockServer():
 
         self.highest_unique_id = 0
         
+    @property
+    def source_str(self):
+        return self.hostname
+
     def set_return_user(self, user):
         self.return_user = user
 
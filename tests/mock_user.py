@@ -17,7 +17,7 @@ class MockUser:
         self.modes = []
         self.recieved_msgs = []
         self.recieved_cmds = []
-        self.channels = []
+        self.channels = set()
 
     def add_mode(self, mode):
         self.modes.append(mode)
@@ -4,7 +4,7 @@ from .mock_server import MockConfig, MockServer
 from .mock_con import MockCon
 from .mock_user import MockUser
 
-from pyircd.channel import Channel
+from pyircd.channel import Channel, NAMREPLY_MAX_LEN
 from pyircd.errors import BadKeyError, ChannelFullError, \
 InsufficientParamsError, NeedChanOpError
 
@@ -247,6 +247,34 @@ class UserModeTest(ChannelModeTest):
             '', self.tchan.get_mode_prefix(self.users[3]),
             'User was given unessecary prefix')
 
+class NamesTest(ChannelTest):
+    def test_names_single_line(self):
+        """Test that a small channel's names fit in one reply."""
+        for user in self.users:
+            self.tchan.join(user)
+        self.tchan.send_user_list(self.users[0])
+        reply = {'command': 353, 'source': None,
+            'params': ['#test', 'user0 user1 user2 user3 user4']}
+        self.assert_in(reply, self.users[0].recieved_cmds)
+
+    def test_names_split(self):
+        """Test that a large channel's names are split over several
+        replies."""
+        for i in range(100):
+            self.tchan.join(MockUser('longnickname' + str(i),
+                    server=self.server, connection=MockCon()))
+        target = self.users[0]
+        self.tchan.send_user_list(target)
+
+        replies = [cmd['params'][1] for cmd in target.recieved_cmds
+                if cmd['command'] == 353]
+        self.assert_true(len(replies) > 1, 'Names were not split')
+        for reply in replies:
+            self.assert_true(len(reply) <= NAMREPLY_MAX_LEN,
+                'Names reply is too long')
+        nicks = ' '.join(replies).split(' ')
+        self.assert_equal(100, len(nicks))
+
 class TopicPermTest(ChannelTest):
     def test_topic_set_disallowed(self):
         """Test a user setting their topic when they're not allowed."""
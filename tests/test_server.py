@@ -169,7 +169,7 @@ class WhoisTest(BasicServerTestCase):
         self.server.join_user_to_channel(self.target_user, '#whoistest')
 
         # Normally done by User object.
-        self.source_user.channels.append('#whoistest')
+        self.source_user.channels.add('#whoistest')
         
         self.server.send_whois('target', self.source_user)
         
@@ -6,6 +6,7 @@ from .mock_user import MockUser
 from .mock_channel import MockChannel
 from . import BasicTestCase
 from pyircd.user import User
+from pyircd import numerics
 
 class BasicUserTestCase(BasicTestCase):
     def setUp(self):
@@ -60,6 +61,13 @@ class UnknownCommandTestCase(BasicUserTestCase):
         self.con.simulate_recv('MADEUPMORE command params :with multi part')
         self.assert_all_in(replies, self.con.sent_msgs)
 
+class NumericTest(BasicUserTestCase):
+    def test_colon_in_param(self):
+        """Test that colons inside numeric parameters are sent unchanged."""
+        self.user.send_numeric(numerics.RPL_TOPIC, ['#test', 'a: b :c'])
+        reply = ':example.com 332 nick #test :a: b :c\r\n'
+        self.assert_in(reply, self.con.sent_msgs)
+
 class UserJoinTest(BasicUserTestCase):
     def test_basic_user_join_valid(self):
         """Test the user correctly joins a channel they are allowed to"""
@@ -85,6 +93,19 @@ class UserJoinTest(BasicUserTestCase):
         reply = ':example.com 471 nick #fullchannel :Cannot join channel (+l)\r\n'
         self.assert_true(reply in self.con.sent_msgs)
 
+    def test_extra_keys(self):
+        """Test that keys without a matching channel are ignored."""
+        self.con.simulate_recv('JOIN #testkey pass,extra')
+        self.assert_equal(
+            [{'user': 'nick', 'channel': '#testkey', 'key': 'pass'}],
+            self.server.channel_joins)
+
+    def test_key_with_colon(self):
+        """Test that a colon inside a middle parameter is kept in it."""
+        self.con.simulate_recv('JOIN #testkey pa:ss')
+        join = {'user': 'nick', 'channel': '#testkey', 'key': 'pa:ss'}
+        self.assert_in(join, self.server.channel_joins)
+
     def test_multi_join(self):
         """Test joining multiple channels in one command."""
         self.con.simulate_recv('JOIN #mtest1,#mtest2')
@@ -138,6 +159,29 @@ class MsgTest(BasicUserTestCase):
         self.assert_true(reply in self.fake_channel.msgs,
             'Message was not sent to the test channel.')
 
+    def test_multiple_targets(self):
+        """Test messaging a channel and a user at once."""
+        self.con.simulate_recv('PRIVMSG #test,nick2, :Hello both')
+        self.assert_in({'source': 'nick', 'message': 'Hello both'},
+            self.fake_channel.msgs)
+        self.assert_equal(
+            [{'from': 'nick', 'channel': 'nick2', 'text': 'Hello both'}],
+            self.fake_user.recieved_msgs)
+
+    def test_lower_case_command(self):
+        """Test that commands are recognised regardless of case."""
+        self.con.simulate_recv('privmsg nick2 :Here is a message')
+        reply = {'from': 'nick', 'channel': 'nick2',
+            'text': 'Here is a message'}
+        self.assert_in(reply, self.fake_user.recieved_msgs)
+
+    def test_too_few_params(self):
+        """Test that a message without any text is rejected."""
+        self.con.simulate_recv('PRIVMSG nick2')
+        reply = ':example.com 461 nick PRIVMSG :Not enough parameters\r\n'
+        self.assert_in(reply, self.con.sent_msgs)
+        self.assert_equal([], self.fake_user.recieved_msgs)
+
 class ModeTest(BasicUserTestCase):
     def test_changing_allowed_mode(self):
         """Test a user adding a mode to themselves with no restrictions."""